@@ -249,6 +249,9 @@ def render_template(template_path: str, **context):
     
     return template
 
+class _Response(dict):
+    """Response dict built by the framework, as opposed to a JSON payload returned by user code."""
+
 class LKServer:
     def __init__(self, port: int = 7000, debug: bool = False, name: str = None, 
                  security: dict = None, token: str = None, check_updates: bool = True,
@@ -270,6 +273,12 @@ class LKServer:
         self.check_updates = check_updates
         self.keepalive_task = None
         self.timeout = timeout
+        self.before_request_funcs = []
+        self.after_request_funcs = []
+        self.middlewares = []
+        self.middleware_exempt = set()
+        self._compiled_routes = None
+        self._after_chain = None
         
     def block_ip(self, ip: str):
         self.blocked_ips.add(ip)
@@ -300,32 +309,232 @@ class LKServer:
         
         return serve_static
         
-    def route(self, path: str, methods: list = None):
+    def route(self, path: str, methods: list = None, middleware: bool = True):
         if methods is None:
             methods = ['GET']
         
         def decorator(func: Callable):
+            try:
+                inspect.signature(func)
+            except (TypeError, ValueError) as e:
+                raise TypeError(f"Cannot register {func!r} for {path}: {e}")
+            
             if path not in self.routes:
                 self.routes[path] = {}
             
             for method in methods:
                 self.routes[path][method.upper()] = func
+                if middleware:
+                    self.middleware_exempt.discard((path, method.upper()))
+                else:
+                    self.middleware_exempt.add((path, method.upper()))
             
+            self._compiled_routes = None
             return func
         
         return decorator
     
-    def get(self, path: str):
-        return self.route(path, methods=['GET'])
+    def get(self, path: str, middleware: bool = True):
+        return self.route(path, methods=['GET'], middleware=middleware)
+    
+    def post(self, path: str, middleware: bool = True):
+        return self.route(path, methods=['POST'], middleware=middleware)
     
-    def post(self, path: str):
-        return self.route(path, methods=['POST'])
+    def put(self, path: str, middleware: bool = True):
+        return self.route(path, methods=['PUT'], middleware=middleware)
+    
+    def delete(self, path: str, middleware: bool = True):
+        return self.route(path, methods=['DELETE'], middleware=middleware)
+    
+    def before_request(self, func: Callable):
+        """Run func(request) before every handler; a non-None return short-circuits it."""
+        self.before_request_funcs.append(func)
+        self._compiled_routes = None
+        return func
+    
+    def after_request(self, func: Callable):
+        """Run func(request, response) on every response, including 404 and 500 pages.
+        
+        response is a dict with 'status', 'headers' and 'body'. Return it (modified
+        in place or not), None to keep it, or any value a handler may return to
+        replace it.
+        """
+        self.after_request_funcs.append(func)
+        self._compiled_routes = None
+        return func
+    
+    def middleware(self, func: Callable):
+        """Register an async func(request, call_next) wrapping every handler.
+        
+        Return the response from call_next, or any value a handler may return
+        to short-circuit the route. Returning None is an error and produces a 500.
+        """
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"Middleware {func.__name__} must be an async function")
+        self.middlewares.append(func)
+        self._compiled_routes = None
+        return func
+    
+    @staticmethod
+    def _coerce_response(result: Any) -> Dict[str, Any]:
+        
+        if isinstance(result, _Response):
+            return result
+        return LKServer._make_response(result)
+    
+    @staticmethod
+    def _error_response(request: Request, error: Exception) -> Dict[str, Any]:
+        
+        print(f"Error in handler {request.path}: {error}")
+        import traceback
+        traceback.print_exc()
+        return _Response({
+            'status': 500,
+            'body': f'<h1>500 Internal Server Error</h1><p>{str(error)}</p>',
+            'headers': {'Content-Type': 'text/html'}
+        })
+    
+    def _build_after_chain(self):
+        
+        after_funcs = tuple((f, inspect.iscoroutinefunction(f)) for f in reversed(self.after_request_funcs))
+        coerce_response = self._coerce_response
+        
+        async def run_after(request, response):
+            for func, is_async in after_funcs:
+                result = func(request, response)
+                if is_async:
+                    result = await result
+                if result is not None:
+                    response = coerce_response(result)
+            return response
+        
+        return run_after
+    
+    def _build_endpoint(self, handler: Callable):
+        
+        takes_request = len(inspect.signature(handler).parameters) > 0
+        make_response = self._make_response
+        
+        if inspect.iscoroutinefunction(handler):
+            if takes_request:
+                async def endpoint(request):
+                    return make_response(await handler(request))
+            else:
+                async def endpoint(request):
+                    return make_response(await handler())
+        else:
+            if takes_request:
+                async def endpoint(request):
+                    return make_response(handler(request))
+            else:
+                async def endpoint(request):
+                    return make_response(handler())
+        
+        return endpoint
+    
+    def _build_chain(self, handler: Callable, use_middleware: bool = True):
+        """Compose hooks, middleware and handler into a single coroutine function."""
+        endpoint = self._build_endpoint(handler)
+        
+        if not use_middleware:
+            return endpoint
+        
+        chain = endpoint
+        for mw in reversed(self.middlewares):
+            chain = self._wrap_middleware(mw, chain)
+        
+        if not self.before_request_funcs and not self.after_request_funcs:
+            return chain
+        
+        before_funcs = tuple((f, inspect.iscoroutinefunction(f)) for f in self.before_request_funcs)
+        run_after = self._after_chain
+        coerce_response = self._coerce_response
+        error_response = self._error_response
+        inner = chain
+        
+        async def hooked(request):
+            try:
+                response = None
+                for func, is_async in before_funcs:
+                    result = func(request)
+                    if is_async:
+                        result = await result
+                    if result is not None:
+                        response = coerce_response(result)
+                        break
+                
+                if response is None:
+                    response = await inner(request)
+            except Exception as e:
+                response = error_response(request, e)
+            
+            return await run_after(request, response)
+        
+        return hooked
+    
+    def _wrap_middleware(self, mw: Callable, call_next: Callable):
+        
+        coerce_response = self._coerce_response
+        
+        async def wrapped(request):
+            result = await mw(request, call_next)
+            
+            if result is None:
+                raise TypeError(f"Middleware {mw.__name__} returned None; return the response from call_next")
+            return coerce_response(result)
+        
+        return wrapped
     
-    def put(self, path: str):
-        return self.route(path, methods=['PUT'])
+    def _compile_routes(self):
+        
+        self._after_chain = self._build_after_chain()
+        compiled = {}
+        for path, methods in self.routes.items():
+            compiled[path] = {}
+            for method, handler in methods.items():
+                use_middleware = (path, method) not in self.middleware_exempt
+                compiled[path][method] = self._build_chain(handler, use_middleware)
+        
+        self._compiled_routes = compiled
+        return compiled
     
-    def delete(self, path: str):
-        return self.route(path, methods=['DELETE'])
+    @staticmethod
+    def _make_response(result: Any) -> Dict[str, Any]:
+        
+        if isinstance(result, dict):
+            return _Response({
+                'status': 200,
+                'body': json.dumps(result),
+                'headers': {'Content-Type': 'application/json'}
+            })
+        elif isinstance(result, tuple):
+            body = result[0]
+            status = result[1]
+            headers = dict(result[2]) if len(result) > 2 else {}
+            encoding = result[3] if len(result) > 3 else None
+            
+            response = _Response({
+                'status': status,
+                'headers': headers
+            })
+            
+            if encoding == 'base64':
+                response['body'] = body
+                response['body_encoding'] = 'base64'
+            elif isinstance(body, dict):
+                response['body'] = json.dumps(body)
+                headers.setdefault('Content-Type', 'application/json')
+            else:
+                response['body'] = str(body)
+                headers.setdefault('Content-Type', 'text/html')
+            
+            return response
+        else:
+            return _Response({
+                'status': 200,
+                'body': str(result),
+                'headers': {'Content-Type': 'text/html'}
+            })
     
     async def _keepalive_loop(self):
         """Envía pings para mantener la conexión viva"""
@@ -358,75 +567,26 @@ class LKServer:
                 'headers': {'Location': target, 'Content-Type': 'text/html'}
             }
         
-        handler = None
-        if request.path in self.routes and request.method in self.routes[request.path]:
-            handler = self.routes[request.path][request.method]
-        
-        if not handler:
-            return {
-                'status': 404,
-                'body': f'<h1>404 Not Found</h1><p>Route {request.method} {request.path} not found</p>',
-                'headers': {'Content-Type': 'text/html'}
-            }
-        
         try:
-            sig = inspect.signature(handler)
-            if len(sig.parameters) > 0:
-                if inspect.iscoroutinefunction(handler):
-                    result = await handler(request)
-                else:
-                    result = handler(request)
-            else:
-                if inspect.iscoroutinefunction(handler):
-                    result = await handler()
-                else:
-                    result = handler()
+            routes = self._compiled_routes
+            if routes is None:
+                routes = self._compile_routes()
             
+            chain = None
+            if request.path in routes and request.method in routes[request.path]:
+                chain = routes[request.path][request.method]
             
-            if isinstance(result, dict):
-                return {
-                    'status': 200,
-                    'body': json.dumps(result),
-                    'headers': {'Content-Type': 'application/json'}
-                }
-            elif isinstance(result, tuple):
-                body = result[0]
-                status = result[1]
-                headers = result[2] if len(result) > 2 else {}
-                encoding = result[3] if len(result) > 3 else None
-                
-                response = {
-                    'status': status,
-                    'headers': headers
-                }
-                
-                if encoding == 'base64':
-                    response['body'] = body
-                    response['body_encoding'] = 'base64'
-                elif isinstance(body, dict):
-                    response['body'] = json.dumps(body)
-                    headers.setdefault('Content-Type', 'application/json')
-                else:
-                    response['body'] = str(body)
-                    headers.setdefault('Content-Type', 'text/html')
-                
-                return response
-            else:
-                return {
-                    'status': 200,
-                    'body': str(result),
+            if not chain:
+                return await self._after_chain(request, _Response({
+                    'status': 404,
+                    'body': f'<h1>404 Not Found</h1><p>Route {request.method} {request.path} not found</p>',
                     'headers': {'Content-Type': 'text/html'}
-                }
+                }))
+            
+            return await chain(request)
         
         except Exception as e:
-            print(f"Error in handler {request.path}: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
-                'status': 500,
-                'body': f'<h1>500 Internal Server Error</h1><p>{str(e)}</p>',
-                'headers': {'Content-Type': 'text/html'}
-            }
+            return self._error_response(request, e)
     
     async def _listen(self):
         try:
@@ -517,6 +677,8 @@ class LKServer:
         print("Connecting to server...")
         
         try:
+            self._compile_routes()
+            
             async with websockets.connect(
                 self.server_url,
                 ping_interval=self.timeout // 10,
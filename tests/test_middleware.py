@@ -0,0 +1,269 @@
+import asyncio
+import unittest
+
+from lkserver import LKServer
+
+
+def call(app, path, method='GET'):
+    return asyncio.run(app._handle_request({'method': method, 'path': path}))
+
+
+class MiddlewareTests(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LKServer(check_updates=False)
+        self.log = []
+
+    def test_hook_order(self):
+        app, log = self.app, self.log
+
+        @app.before_request
+        def before_one(request):
+            log.append('before1')
+
+        @app.before_request
+        async def before_two(request):
+            log.append('before2')
+
+        @app.middleware
+        async def outer(request, call_next):
+            log.append('outer-in')
+            response = await call_next(request)
+            log.append('outer-out')
+            return response
+
+        @app.middleware
+        async def inner(request, call_next):
+            log.append('inner-in')
+            response = await call_next(request)
+            log.append('inner-out')
+            return response
+
+        @app.after_request
+        def after_one(request, response):
+            log.append('after1')
+
+        @app.after_request
+        async def after_two(request, response):
+            log.append('after2')
+            return response
+
+        @app.get('/')
+        def home(request):
+            log.append('handler')
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(log, [
+            'before1', 'before2', 'outer-in', 'inner-in', 'handler',
+            'inner-out', 'outer-out', 'after2', 'after1',
+        ])
+
+    def test_route_opt_out(self):
+        app, log = self.app, self.log
+
+        @app.before_request
+        def before(request):
+            log.append('before')
+            return ('denied', 401)
+
+        @app.get('/health', middleware=False)
+        def health(request):
+            return 'ok'
+
+        response = call(app, '/health')
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(response['body'], 'ok')
+        self.assertEqual(log, [])
+
+    def test_before_request_short_circuit(self):
+        app, log = self.app, self.log
+
+        @app.before_request
+        def deny(request):
+            return {'error': 'unauthorized'}, 401
+
+        @app.after_request
+        def cors(request, response):
+            response['headers']['Access-Control-Allow-Origin'] = '*'
+
+        @app.get('/')
+        def home(request):
+            log.append('handler')
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 401)
+        self.assertEqual(response['body'], '{"error": "unauthorized"}')
+        self.assertEqual(response['headers']['Access-Control-Allow-Origin'], '*')
+        self.assertEqual(log, [])
+
+    def test_late_registration_recompiles(self):
+        app = self.app
+
+        @app.get('/')
+        def home(request):
+            return 'ok'
+
+        self.assertNotIn('X-Late', call(app, '/')['headers'])
+
+        @app.after_request
+        def late(request, response):
+            response['headers']['X-Late'] = '1'
+
+        @app.get('/other')
+        def other(request):
+            return 'other'
+
+        self.assertEqual(call(app, '/')['headers']['X-Late'], '1')
+        self.assertEqual(call(app, '/other')['body'], 'other')
+
+    def test_sync_handler_without_arguments(self):
+        app = self.app
+
+        @app.get('/')
+        def home():
+            return 'no args'
+
+        self.assertEqual(call(app, '/')['body'], 'no args')
+
+    def test_middleware_payload_with_status_and_body_keys(self):
+        app = self.app
+
+        @app.middleware
+        async def reject(request, call_next):
+            return {'status': 'error', 'body': 'nope'}
+
+        @app.after_request
+        def tag(request, response):
+            response['headers']['X-Tag'] = '1'
+
+        @app.get('/')
+        def home(request):
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(response['headers']['Content-Type'], 'application/json')
+        self.assertEqual(response['headers']['X-Tag'], '1')
+
+    def test_after_request_result_is_normalized(self):
+        app = self.app
+
+        @app.after_request
+        def tag(request, response):
+            response['headers']['X-Tag'] = '1'
+
+        @app.after_request
+        def replace(request, response):
+            return 'hi', 201
+
+        @app.get('/')
+        def home(request):
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 201)
+        self.assertEqual(response['body'], 'hi')
+        self.assertEqual(response['headers']['X-Tag'], '1')
+
+    def test_handler_headers_are_not_shared(self):
+        app = self.app
+        shared_headers = {'Content-Type': 'text/plain'}
+
+        @app.after_request
+        def tag(request, response):
+            response['headers']['X-Tag'] = '1'
+
+        @app.get('/')
+        def home(request):
+            return 'ok', 200, shared_headers
+
+        self.assertEqual(call(app, '/')['headers']['X-Tag'], '1')
+        self.assertEqual(shared_headers, {'Content-Type': 'text/plain'})
+
+    def test_after_request_runs_on_errors(self):
+        app = self.app
+
+        @app.after_request
+        def cors(request, response):
+            response['headers']['Access-Control-Allow-Origin'] = '*'
+
+        @app.get('/boom')
+        def boom(request):
+            raise ValueError('boom')
+
+        missing = call(app, '/missing')
+        self.assertEqual(missing['status'], 404)
+        self.assertEqual(missing['headers']['Access-Control-Allow-Origin'], '*')
+
+        failed = call(app, '/boom')
+        self.assertEqual(failed['status'], 500)
+        self.assertEqual(failed['headers']['Access-Control-Allow-Origin'], '*')
+
+    def test_after_request_runs_once_when_a_hook_raises(self):
+        app, log = self.app, self.log
+
+        @app.after_request
+        def first(request, response):
+            log.append('first')
+
+        @app.after_request
+        def bad(request, response):
+            log.append('bad')
+            raise RuntimeError('bad hook')
+
+        @app.after_request
+        def last(request, response):
+            log.append('last')
+
+        @app.get('/')
+        def home(request):
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 500)
+        self.assertEqual(log, ['last', 'bad'])
+
+    def test_after_request_runs_once_on_handler_error(self):
+        app, log = self.app, self.log
+
+        @app.after_request
+        def count(request, response):
+            log.append(response['status'])
+
+        @app.get('/boom')
+        def boom(request):
+            raise ValueError('boom')
+
+        self.assertEqual(call(app, '/boom')['status'], 500)
+        self.assertEqual(log, [500])
+
+    def test_middleware_returning_none_is_an_error(self):
+        app = self.app
+
+        @app.middleware
+        async def forgetful(request, call_next):
+            await call_next(request)
+
+        @app.get('/')
+        def home(request):
+            return 'ok'
+
+        response = call(app, '/')
+        self.assertEqual(response['status'], 500)
+        self.assertIn('forgetful', response['body'])
+
+    def test_rejects_sync_middleware(self):
+        with self.assertRaises(TypeError):
+            self.app.middleware(lambda request, call_next: None)
+
+    def test_rejects_uninspectable_handler(self):
+        handler = type('Handler', (), {'__call__': lambda self: None, '__signature__': 'invalid'})()
+        with self.assertRaises(TypeError):
+            self.app.route('/')(handler)
+
+
+if __name__ == '__main__':
+    unittest.main()